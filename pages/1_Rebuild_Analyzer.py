@@ -3,27 +3,11 @@
 import io
 from contextlib import redirect_stdout
 import pandas as pd
+import plotly.express as px
 import streamlit as st
-from pathlib import Path
 
 from nba_rebuilds import fetch_data, rebuilds
-
-def aggregate_by_team(df: pd.DataFrame) -> pd.DataFrame:
-    """Aggregate multi-season standings into one row per team."""
-    return (
-        df.groupby("TeamName")
-        .agg(
-            Seasons=("SeasonID", "nunique"),
-            AvgWins=("Wins", "mean"),
-            AvgWinPct=("WinPct", "mean"),
-            PlayoffAppearances=("MadePlayoffs", "sum"),
-            PlayoffRate=("MadePlayoffs", "mean"),
-            FirstSeason=("SeasonID", "min"),
-            LastSeason=("SeasonID", "max"),
-        )
-        .reset_index()
-        .sort_values("AvgWinPct", ascending=False)
-    )
+from nba_rebuilds.rolling import TeamSeasonCube
 
 
 def _run_with_capture(func, *args, **kwargs) -> str:
@@ -39,9 +23,8 @@ def load_season_csv(year: int) -> pd.DataFrame:
     season_end = str(year)[-2:]
     season_id = f"{season_start}-{season_end}"
 
-    # Project root is where 'src/nba_rebuilds/data/' lives
-    PROJECT_ROOT = Path(__file__).resolve().parent.parent  # adjust if needed
-    file_path = PROJECT_ROOT / "src" / "nba_rebuilds" / "data" / f"standings_{season_id}.csv"
+    # Same directory fetch_data writes to (src/nba_rebuilds/data/)
+    file_path = fetch_data.DATA_DIR / f"standings_{season_id}.csv"
 
     if not file_path.exists():
         raise FileNotFoundError(file_path)
@@ -51,6 +34,28 @@ def load_season_csv(year: int) -> pd.DataFrame:
     return df
 
 
+def standings_versions() -> tuple:
+    """(name, mtime, size) of every local standings CSV, used as the cube's cache key."""
+    files = sorted(fetch_data.DATA_DIR.glob("standings_*-*.csv"))
+    return tuple((f.name, f.stat().st_mtime_ns, f.stat().st_size) for f in files)
+
+
+@st.cache_resource(max_entries=4)
+def load_team_cube(versions: tuple):
+    """Build prefix-sum team x season arrays from the standings CSVs in ``versions``.
+
+    Keyed on file versions so CSVs written outside this page (e.g. the nightly
+    ``fetch_data --sync`` job) rebuild the cube on the next rerun.
+    """
+    if not versions:
+        return None
+    dfs = [
+        pd.read_csv(fetch_data.DATA_DIR / name).assign(SeasonID=name.removeprefix("standings_").removesuffix(".csv"))
+        for name, _, _ in versions
+    ]
+    return TeamSeasonCube(pd.concat(dfs, ignore_index=True))
+
+
 
 def main() -> None:
     st.title("NBA Rebuild Analyzer")
@@ -69,6 +74,7 @@ def main() -> None:
         fetch_button = st.button("Fetch Standings via nba_api")
         compute_button = st.button("Compute Rebuilds")
         view_mode = st.radio("Data View", ["Team Summary", "Raw Season Data"])
+        rolling_window = st.selectbox("Rolling Window (seasons)", [3, 5, 10], index=0)
 
     # FETCH DATA (multi-season)
     if fetch_button:
@@ -94,12 +100,38 @@ def main() -> None:
 
     st.subheader("Data Preview")
 
+    cube = load_team_cube(standings_versions())
+
     if view_mode == "Team Summary":
-        df_team = aggregate_by_team(df_all)
+        df_team = cube.window(start_year, end_year)
         st.dataframe(df_team, use_container_width=True)
     else:
         st.dataframe(df_all, use_container_width=True)
 
+    # ROLLING TRENDS
+    st.subheader(f"Rolling {rolling_window}-Season Trends")
+    df_rolling = cube.rolling(rolling_window)
+    df_rolling = df_rolling[df_rolling["Year"].between(start_year, end_year)]
+
+    if df_rolling.empty:
+        st.info(f"Load at least {rolling_window} consecutive seasons to see rolling trends.")
+    else:
+        teams = st.multiselect(
+            "Teams", list(cube.teams), default=list(cube.window(start_year, end_year)["TeamName"][:5])
+        )
+        df_trend = df_rolling[df_rolling["TeamName"].isin(teams)]
+        for metric, label in [("WinPct", "Win %"), ("PlayoffRate", "Playoff Rate")]:
+            fig = px.line(
+                df_trend,
+                x="SeasonID",
+                y=metric,
+                color="TeamName",
+                markers=True,
+                title=f"Rolling {rolling_window}-Season {label}",
+            )
+            fig.update_layout(xaxis_title="Window End Season", yaxis_title=label)
+            st.plotly_chart(fig, use_container_width=True)
+
     # REBUILD ANALYSIS
     if compute_button:
         st.subheader("Rebuild Analysis")
@@ -182,28 +182,67 @@ if st.button("🔮 Predict Playoff Return Time", type="primary", use_container_w
     else:
         st.warning("🔄 **Extended Rebuild** - Significant changes may be needed. Consider long-term strategic planning.")
     
-    # Feature importance visualization
-    importance_df = predictor.get_feature_importance()
-    if importance_df is not None:
+    # Per-roster feature contributions; models TreeSHAP can't read (anything
+    # but sklearn trees) fall back to the model's global feature importance
+    try:
+        contributions = predictor.explain(team_data).iloc[0]
+    except TypeError:
+        contributions = None
+
+    if contributions is not None:
+        contrib_df = (
+            contributions.rename("contribution")
+            .rename_axis("feature")
+            .reset_index()
+            .assign(direction=lambda d: d["contribution"].map(lambda v: "Adds years" if v > 0 else "Removes years"))
+        )
+        contrib_df = contrib_df.reindex(contrib_df["contribution"].abs().sort_values().index)
+        
         st.markdown("### 📈 Key Factors")
+        st.caption(
+            f"How each roster input moves this prediction away from the average "
+            f"prediction of {predictor.expected_value:.2f} years."
+        )
         
         # Create horizontal bar chart
         fig = px.bar(
-            importance_df,
-            x='importance',
+            contrib_df,
+            x='contribution',
             y='feature',
             orientation='h',
-            title='Feature Importance in Prediction',
-            color='importance',
-            color_continuous_scale='Viridis'
+            title='Feature Contributions to This Prediction',
+            color='direction',
+            color_discrete_map={"Adds years": "#d62728", "Removes years": "#2ca02c"}
         )
         fig.update_layout(
-            showlegend=False,
             height=400,
-            xaxis_title="Importance Score",
-            yaxis_title=""
+            xaxis_title="Contribution (years)",
+            yaxis_title="",
+            legend_title_text=""
         )
         st.plotly_chart(fig, use_container_width=True)
+    else:
+        importance_df = predictor.get_feature_importance()
+        if importance_df is not None:
+            st.markdown("### 📈 Key Factors")
+            
+            # Create horizontal bar chart
+            fig = px.bar(
+                importance_df,
+                x='importance',
+                y='feature',
+                orientation='h',
+                title='Feature Importance in Prediction',
+                color='importance',
+                color_continuous_scale='Viridis'
+            )
+            fig.update_layout(
+                showlegend=False,
+                height=400,
+                xaxis_title="Importance Score",
+                yaxis_title=""
+            )
+            st.plotly_chart(fig, use_container_width=True)
     
     # Team profile summary
     st.markdown("### 📋 Team Profile Summary")
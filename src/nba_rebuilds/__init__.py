@@ -5,5 +5,6 @@ __version__ = "0.1.0"
 from .predictor import PlayoffPredictor
 from .fetch_data import save_standings
 from .rebuilds import compute_rebuilds
+from .rolling import TeamSeasonCube
 
-__all__ = ["PlayoffPredictor", "save_standings", "compute_rebuilds"]
\ No newline at end of file
+__all__ = ["PlayoffPredictor", "save_standings", "compute_rebuilds", "TeamSeasonCube"]
\ No newline at end of file
@@ -0,0 +1,478 @@
+"""Concurrent-session load test for the Streamlit pages.
+
+Drives N simulated users through scripted interactions with Streamlit's
+``AppTest`` in one process, so ``@st.cache_resource`` / ``@st.cache_data``
+are shared between sessions exactly as on a server. ``AppTest`` sets up and
+tears down process-wide Streamlit state around every run, so sessions are
+interleaved one rerun at a time rather than executed in parallel: latencies
+are single-rerun costs with shared caches, not contention. Runs fully offline:
+nba_api is replaced with a stub built from the bundled playoff data and
+standings are written to a temporary data directory.
+
+    uv run python -m nba_rebuilds.app_loadtest --sessions 8 --iterations 3 --budget-p95-ms 1500
+
+Reports per-rerun latency percentiles by page and step, peak RSS and cache
+hit rates, and exits non-zero if any configured budget is exceeded.
+"""
+
+import argparse
+import json
+import logging
+import resource
+import sys
+import tempfile
+import threading
+import time
+import types
+import zlib
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from nba_rebuilds import fetch_data
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+PLAYOFFS_CSV = Path(__file__).resolve().parent / "data" / "nba_playoffs_binary_2010_2025.csv"
+
+PAGES = {
+    "home": "streamlit_app.py",
+    "analyzer": "pages/1_Rebuild_Analyzer.py",
+    "predictor": "pages/2_Playoff_Predictor.py",
+}
+
+EAST = {
+    "Atlanta Hawks", "Boston Celtics", "Brooklyn Nets", "Charlotte Hornets", "Chicago Bulls",
+    "Cleveland Cavaliers", "Detroit Pistons", "Indiana Pacers", "Miami Heat", "Milwaukee Bucks",
+    "New York Knicks", "Orlando Magic", "Philadelphia 76ers", "Toronto Raptors", "Washington Wizards",
+}
+
+# AppTest swaps the global Runtime, config and pages state in and out on
+# every run; overlapping runs break each other's script threads
+_RUN_LOCK = threading.Lock()
+
+DEFAULT_BUDGETS = {
+    "p50_ms": None,
+    "p95_ms": None,
+    "p99_ms": None,
+    "peak_rss_mb": None,
+    "min_cache_hit_rate": None,
+    "max_errors": 0,
+}
+
+
+# ---------------------------------------------------------------------------
+# Offline nba_api stub
+# ---------------------------------------------------------------------------
+
+class StubLeagueStandings:
+    """Stands in for ``nba_api.stats.endpoints.leaguestandings.LeagueStandings``"""
+
+    _playoffs = None
+
+    def __init__(self, season="2023-24", **kwargs):
+        if StubLeagueStandings._playoffs is None:
+            StubLeagueStandings._playoffs = pd.read_csv(PLAYOFFS_CSV)
+        df = StubLeagueStandings._playoffs
+        self.season = season
+        self._teams = df[df["season"] == season]
+
+    def get_data_frames(self):
+        rows = []
+        for team, playoffs in zip(self._teams["team_name"], self._teams["playoffs"]):
+            # Deterministic records: playoff teams finish above the cut line
+            seed = zlib.crc32(f"{self.season}|{team}".encode())
+            wins = 42 + seed % 20 if playoffs else 20 + seed % 22
+            rows.append({
+                "TeamName": team,
+                "Conference": "East" if team in EAST else "West",
+                "WINS": wins,
+                "LOSSES": 82 - wins,
+                "WinPCT": round(wins / 82, 3),
+            })
+        df = pd.DataFrame(rows, columns=["TeamName", "Conference", "WINS", "LOSSES", "WinPCT"])
+        # nba_api returns teams in conference rank order
+        return [df.sort_values(["Conference", "WINS"], ascending=[True, False]).reset_index(drop=True)]
+
+
+@contextmanager
+def offline_environment(data_dir: Path, start: int, end: int):
+    """Stub nba_api, point fetch_data at ``data_dir`` and seed it with standings"""
+    from nba_api.stats.endpoints import leaguestandings
+
+    saved = (leaguestandings.LeagueStandings, fetch_data.DATA_DIR, fetch_data.time)
+    leaguestandings.LeagueStandings = StubLeagueStandings
+    fetch_data.DATA_DIR = Path(data_dir)
+    # The stub has no rate limit; skip the pause between API calls
+    fetch_data.time = types.SimpleNamespace(sleep=lambda seconds: None)
+    try:
+        fetch_data.save_standings(start, end)
+        yield
+    finally:
+        leaguestandings.LeagueStandings, fetch_data.DATA_DIR, fetch_data.time = saved
+
+
+# ---------------------------------------------------------------------------
+# Cache instrumentation
+# ---------------------------------------------------------------------------
+
+class CacheCounter:
+    """Count Streamlit cache lookups and hits per cached function"""
+
+    def __init__(self):
+        self.lookups = defaultdict(int)
+        self.hits = defaultdict(int)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def installed(self):
+        from streamlit.runtime.caching import cache_utils
+
+        cls = getattr(cache_utils, "CachedFunc", None)
+        if cls is None or not hasattr(cls, "_get_or_create_cached_value") or not hasattr(cls, "_handle_cache_hit"):
+            # Internal API moved; report hit rates as unavailable
+            yield False
+            return
+
+        lookup, hit = cls._get_or_create_cached_value, cls._handle_cache_hit
+        counter = self
+
+        def counted_lookup(self, *args, **kwargs):
+            with counter._lock:
+                counter.lookups[self._info.func.__qualname__] += 1
+            return lookup(self, *args, **kwargs)
+
+        def counted_hit(self, *args, **kwargs):
+            with counter._lock:
+                counter.hits[self._info.func.__qualname__] += 1
+            return hit(self, *args, **kwargs)
+
+        cls._get_or_create_cached_value, cls._handle_cache_hit = counted_lookup, counted_hit
+        try:
+            yield True
+        finally:
+            cls._get_or_create_cached_value, cls._handle_cache_hit = lookup, hit
+
+    def summary(self) -> dict:
+        return {
+            name: {
+                "lookups": lookups,
+                "hits": self.hits[name],
+                "hit_rate": self.hits[name] / lookups,
+            }
+            for name, lookups in sorted(self.lookups.items())
+        }
+
+
+class ScriptThreadErrors:
+    """Collect exceptions that escape Streamlit's script threads
+
+    A script thread that dies outside the page code (e.g. in Streamlit's own
+    run setup) leaves ``AppTest.exception`` empty, so the rerun would
+    otherwise look like a fast success.
+    """
+
+    def __init__(self):
+        self.errors = []
+
+    @contextmanager
+    def installed(self):
+        previous = threading.excepthook
+
+        def hook(args):
+            self.errors.append(f"{args.exc_type.__name__}: {args.exc_value} (in {args.thread.name})")
+
+        threading.excepthook = hook
+        try:
+            yield self
+        finally:
+            threading.excepthook = previous
+
+
+# ---------------------------------------------------------------------------
+# Scripted sessions
+# ---------------------------------------------------------------------------
+
+def _widget(elements, label):
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError(f"No widget labelled {label!r}")
+
+
+def analyzer_steps(start: int, end: int):
+    """Change year ranges, compute rebuilds, switch views"""
+
+    def set_range(at, rng):
+        # lo + 2 <= end, so the smallest allowed span (three seasons) still works
+        lo = int(rng.integers(start, end - 1))
+        _widget(at.sidebar.number_input, "Start NBA Year").set_value(lo)
+        _widget(at.sidebar.number_input, "End NBA Year").set_value(int(rng.integers(lo + 2, end + 1)))
+
+    def compute(at, rng):
+        _widget(at.sidebar.button, "Compute Rebuilds").click()
+
+    def raw_view(at, rng):
+        _widget(at.sidebar.radio, "Data View").set_value("Raw Season Data")
+
+    def summary_view(at, rng):
+        _widget(at.sidebar.radio, "Data View").set_value("Team Summary")
+        _widget(at.sidebar.selectbox, "Rolling Window (seasons)").set_value(int(rng.choice([3, 5])))
+
+    return [("change_years", set_range), ("compute_rebuilds", compute),
+            ("raw_view", raw_view), ("summary_view", summary_view)]
+
+
+def predictor_steps():
+    """Edit roster inputs and submit predictions"""
+
+    def edit_roster(at, rng):
+        _widget(at.slider, "Continuity Percentage").set_value(float(rng.integers(0, 1000)) / 10)
+        _widget(at.number_input, "Average Age").set_value(float(rng.integers(230, 300)) / 10)
+        _widget(at.number_input, "All-NBA Players").set_value(int(rng.integers(0, 3)))
+
+    def predict(at, rng):
+        _widget(at.button, "🔮 Predict Playoff Return Time").click()
+
+    return [("edit_roster", edit_roster), ("predict", predict)]
+
+
+def run_session(page: str, script: Path, steps, iterations: int, seed: int, timeout: float, record,
+                thread_errors: ScriptThreadErrors):
+    """One simulated user: initial load, then ``iterations`` passes over ``steps``"""
+    from streamlit.testing.v1 import AppTest
+
+    rng = np.random.default_rng(seed)
+    at = AppTest.from_file(str(script), default_timeout=timeout)
+
+    def rerun(step):
+        # Only one rerun runs at a time, so any script thread crash seen
+        # while holding the lock belongs to this rerun
+        with _RUN_LOCK:
+            seen = len(thread_errors.errors)
+            start = time.perf_counter()
+            try:
+                at.run()
+                errors = [e.message for e in at.exception]
+            except Exception as e:
+                errors = [f"{type(e).__name__}: {e}"]
+            elapsed = time.perf_counter() - start
+            errors += thread_errors.errors[seen:]
+        record(page, step, elapsed, "; ".join(errors) or None)
+
+    rerun("initial")
+    for _ in range(iterations):
+        for step, action in steps:
+            try:
+                action(at, rng)
+            except Exception as e:
+                record(page, step, 0.0, f"{type(e).__name__}: {e}")
+                continue
+            rerun(step)
+
+
+# ---------------------------------------------------------------------------
+# Harness
+# ---------------------------------------------------------------------------
+
+def quiet_streamlit_logs():
+    """Silence per-rerun warnings (missing ScriptRunContext, deprecations) in the report"""
+    from streamlit import config
+    from streamlit.logger import set_log_level
+
+    # Streamlit re-applies logger.level whenever its config is parsed, which
+    # AppTest does lazily, so set the option as well as the current level
+    config.set_option("logger.level", "error")
+    set_log_level(logging.ERROR)
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def _percentiles(latencies) -> dict:
+    lat_ms = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(lat_ms, [50, 95, 99])
+    return {"count": len(lat_ms), "p50_ms": float(p50), "p95_ms": float(p95),
+            "p99_ms": float(p99), "max_ms": float(lat_ms.max())}
+
+
+def run_load_test(sessions: int = 4, iterations: int = 2, pages=("analyzer", "predictor"),
+                  start: int = 2011, end: int = 2025, seed: int = 0, timeout: float = 60.0,
+                  app_root: Path = PROJECT_ROOT) -> dict:
+    """
+    Run ``sessions`` concurrent scripted sessions spread across ``pages``
+
+    Sessions run in their own threads but their reruns are serialized (see
+    the module docstring); a rerun whose script thread crashes counts as an
+    error, not a latency sample.
+
+    Returns:
+        Dict with latency percentiles overall / per page / per step, throughput,
+        peak RSS, cache hit rates and errors
+    """
+    if start + 2 > end:
+        raise ValueError("Need at least three seasons between start and end")
+
+    steps_for = {
+        "home": [],
+        "analyzer": analyzer_steps(start, end),
+        "predictor": predictor_steps(),
+    }
+    latencies = defaultdict(list)
+    errors = []
+    lock = threading.Lock()
+
+    def record(page, step, seconds, error):
+        with lock:
+            if error:
+                errors.append({"page": page, "step": step, "error": error})
+            else:
+                latencies[(page, step)].append(seconds)
+
+    cache_counter = CacheCounter()
+    rss_before = peak_rss_mb()
+    with tempfile.TemporaryDirectory() as data_dir, offline_environment(Path(data_dir), start, end), \
+            cache_counter.installed() as counting, ScriptThreadErrors().installed() as thread_errors:
+        threads = []
+        for i in range(sessions):
+            page = pages[i % len(pages)]
+            args = (page, Path(app_root) / PAGES[page], steps_for[page], iterations, seed + i, timeout,
+                    record, thread_errors)
+            threads.append(threading.Thread(target=run_session, args=args, name=f"session-{i}"))
+
+        began = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - began
+
+    all_latencies = [s for values in latencies.values() for s in values]
+    by_page = defaultdict(list)
+    for (page, _), values in latencies.items():
+        by_page[page].extend(values)
+
+    return {
+        "sessions": sessions,
+        "iterations": iterations,
+        "seconds": elapsed,
+        "reruns": len(all_latencies),
+        "reruns_per_s": len(all_latencies) / elapsed if elapsed > 0 else 0.0,
+        "overall": _percentiles(all_latencies) if all_latencies else None,
+        "pages": {page: _percentiles(values) for page, values in sorted(by_page.items())},
+        "steps": {f"{page}/{step}": _percentiles(values) for (page, step), values in sorted(latencies.items())},
+        "rss_mb": {"before": rss_before, "peak": peak_rss_mb()},
+        "caches": cache_counter.summary() if counting else None,
+        "errors": errors,
+    }
+
+
+def check_budgets(report: dict, budgets: dict) -> list:
+    """Return a human-readable line for every budget the report exceeds"""
+    violations = []
+    overall = report["overall"] or {}
+    for key in ("p50_ms", "p95_ms", "p99_ms"):
+        limit = budgets.get(key)
+        if limit is not None and overall.get(key, 0.0) > limit:
+            violations.append(f"overall {key} {overall[key]:.1f} > {limit}")
+
+    limit = budgets.get("peak_rss_mb")
+    if limit is not None and report["rss_mb"]["peak"] > limit:
+        violations.append(f"peak RSS {report['rss_mb']['peak']:.1f} MB > {limit}")
+
+    limit = budgets.get("min_cache_hit_rate")
+    if limit is not None:
+        if report["caches"] is None:
+            violations.append("cache hit rate unavailable for this Streamlit version")
+        for name, stats in (report["caches"] or {}).items():
+            if stats["hit_rate"] < limit:
+                violations.append(f"cache {name} hit rate {stats['hit_rate']:.2f} < {limit}")
+
+    limit = budgets.get("max_errors")
+    if limit is not None and len(report["errors"]) > limit:
+        violations.append(f"{len(report['errors'])} errors > {limit}")
+    return violations
+
+
+def print_report(report: dict, violations: list):
+    print(f"{report['sessions']} sessions x {report['iterations']} iterations: "
+          f"{report['reruns']} reruns in {report['seconds']:.1f}s ({report['reruns_per_s']:.1f}/s)")
+    header = f"{'':32} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+    print(header)
+    rows = [("overall", report["overall"])] + list(report["pages"].items()) + list(report["steps"].items())
+    for name, stats in rows:
+        if stats:
+            print(f"{name:32} {stats['count']:5d} {stats['p50_ms']:9.1f} {stats['p95_ms']:9.1f} "
+                  f"{stats['p99_ms']:9.1f} {stats['max_ms']:9.1f}")
+    print(f"Peak RSS: {report['rss_mb']['peak']:.1f} MB (before sessions: {report['rss_mb']['before']:.1f} MB)")
+
+    if report["caches"] is None:
+        print("Cache hit rates: unavailable")
+    for name, stats in (report["caches"] or {}).items():
+        print(f"Cache {name}: {stats['hits']}/{stats['lookups']} hits ({stats['hit_rate']:.0%})")
+
+    for error in report["errors"][:10]:
+        print(f"ERROR {error['page']}/{error['step']}: {error['error']}")
+
+    if violations:
+        print("BUDGET EXCEEDED:")
+        for line in violations:
+            print(f"  - {line}")
+    else:
+        print("All budgets met.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline concurrent-session load test for the Streamlit pages")
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--iterations", type=int, default=2)
+    parser.add_argument("--pages", nargs="+", choices=sorted(PAGES), default=["analyzer", "predictor"])
+    parser.add_argument("--start", type=int, default=2011, help="First NBA year of seeded standings")
+    parser.add_argument("--end", type=int, default=2025, help="Last NBA year of seeded standings")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-rerun AppTest timeout (s)")
+    parser.add_argument("--app-root", type=str, default=str(PROJECT_ROOT))
+    parser.add_argument("--budgets", type=str, default=None, help="JSON file of budget overrides")
+    parser.add_argument("--budget-p50-ms", type=float, default=None)
+    parser.add_argument("--budget-p95-ms", type=float, default=None)
+    parser.add_argument("--budget-p99-ms", type=float, default=None)
+    parser.add_argument("--budget-rss-mb", type=float, default=None)
+    parser.add_argument("--budget-hit-rate", type=float, default=None)
+    parser.add_argument("--max-errors", type=int, default=None)
+    parser.add_argument("--json", type=str, default=None, help="Also write the report to this file")
+    args = parser.parse_args()
+
+    budgets = dict(DEFAULT_BUDGETS)
+    if args.budgets:
+        with open(args.budgets) as f:
+            budgets.update(json.load(f))
+    overrides = {
+        "p50_ms": args.budget_p50_ms,
+        "p95_ms": args.budget_p95_ms,
+        "p99_ms": args.budget_p99_ms,
+        "peak_rss_mb": args.budget_rss_mb,
+        "min_cache_hit_rate": args.budget_hit_rate,
+        "max_errors": args.max_errors,
+    }
+    budgets.update({k: v for k, v in overrides.items() if v is not None})
+
+    quiet_streamlit_logs()
+
+    report = run_load_test(args.sessions, args.iterations, args.pages, args.start, args.end,
+                           args.seed, args.timeout, Path(args.app_root))
+    violations = check_budgets(report, budgets)
+    print_report(report, violations)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"budgets": budgets, "violations": violations, **report}, f, indent=2)
+    if violations:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
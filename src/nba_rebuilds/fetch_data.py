@@ -1,55 +1,207 @@
 import argparse
+import hashlib
+import json
 import os
+import stat
+import tempfile
 import time
+from datetime import datetime, timezone
 from nba_rebuilds.scraping import get_standings
 from pathlib import Path
 
 DATA_DIR = Path(__file__).resolve().parent / "data"
+MANIFEST_NAME = "standings_manifest.json"
+FIRST_SYNC_YEAR = 2010
+# Standings are final once the playoffs are over
+SEASON_FINAL_MONTH = 7
+
+def season_id_for(year):
+    # NBA API seasons are formatted like 2009-10, 2010-11
+    return f"{year - 1}-{str(year)[-2:]}"
+
+def current_nba_year(now=None):
+    """NBA year of the latest season that has started (2026-27 -> 2027)."""
+    now = now or datetime.now(timezone.utc)
+    return now.year + 1 if now.month >= 10 else now.year
+
+def is_season_final(year, fetched_at):
+    """A season's standings are final if fetched after that season's playoffs."""
+    return fetched_at >= datetime(year, SEASON_FINAL_MONTH, 1, tzinfo=timezone.utc)
+
+def _default_file_mode(path):
+    """Mode a plain open() would give: the existing file's, else 0o666 less the umask."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def atomic_write_bytes(path, data):
+    """Write via a temp file and rename so readers never see a partial file."""
+    path = Path(path)
+    mode = _default_file_mode(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file 0600
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def load_manifest():
+    path = DATA_DIR / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def save_manifest(manifest):
+    data = json.dumps(manifest, indent=2, sort_keys=True).encode()
+    atomic_write_bytes(DATA_DIR / MANIFEST_NAME, data)
+
+def file_sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def fetch_season_csv(season_id):
+    """Fetch one season from nba_api and return it as CSV bytes."""
+    df = get_standings(season_id)
+
+    # Rename columns to match workflow
+    df = df.rename(columns={
+        'WINS': 'Wins',
+        'LOSSES': 'Losses',
+        'WinPCT': 'WinPct'
+    })
+    df['Season'] = season_id
+
+    # Top 8 teams per conference make playoffs
+    df['MadePlayoffs'] = 0
+    df.loc[df.groupby('Conference').cumcount() < 8, 'MadePlayoffs'] = 1
+
+    return df.to_csv(index=False).encode()
+
+def _record(manifest, year, season_id, digest, fetched_at):
+    manifest[season_id] = {
+        "year": year,
+        "fetched_at": fetched_at.isoformat(),
+        "sha256": digest,
+        "final": is_season_final(year, fetched_at),
+    }
+    save_manifest(manifest)
 
 def save_standings(start, end):
     os.makedirs(DATA_DIR, exist_ok=True)
+    manifest = load_manifest()
 
     for year in range(start, end + 1):
-        # NBA API seasons are formatted like 2009-10, 2010-11
-        season_start = year - 1
-        season_end = str(year)[-2:]
-        season_id = f"{season_start}-{season_end}"
+        season_id = season_id_for(year)
 
         print(f"Fetching standings for {season_id}...")
-        df = get_standings(season_id)
-
-        # Rename columns to match workflow
-        df = df.rename(columns={
-            'WINS': 'Wins',
-            'LOSSES': 'Losses',
-            'WinPCT': 'WinPct'
-        })
-        df['Season'] = season_id
-
-        # Top 8 teams per conference make playoffs
-        df['MadePlayoffs'] = 0
-        df.loc[df.groupby('Conference').cumcount() < 8, 'MadePlayoffs'] = 1
+        data = fetch_season_csv(season_id)
 
         # Pause between API calls
         time.sleep(1)
 
-        outfile = os.path.join(DATA_DIR, f"standings_{season_id}.csv")
-        df.to_csv(outfile, index=False)
+        outfile = DATA_DIR / f"standings_{season_id}.csv"
+        atomic_write_bytes(outfile, data)
+        _record(manifest, year, season_id, hashlib.sha256(data).hexdigest(), datetime.now(timezone.utc))
         print(f"Saved → {outfile}")
 
     print("Done!")
 
+def sync_standings(start=None, end=None, verify=False, now=None):
+    """
+    Incrementally fetch standings, resuming from the manifest.
+
+    Seasons already fetched after their playoffs ended (and whose file still
+    matches the recorded hash) are skipped. The in-progress season, missing
+    or modified files, and, with ``verify``, every final season are fetched
+    again; files are only rewritten when the content hash changed.
+
+    Returns:
+        Dict of season ids by outcome: updated, unchanged, skipped, failed
+    """
+    os.makedirs(DATA_DIR, exist_ok=True)
+    manifest = load_manifest()
+    latest = current_nba_year(now)
+
+    if start is None:
+        recorded = [entry["year"] for entry in manifest.values()]
+        start = min(recorded) if recorded else FIRST_SYNC_YEAR
+    end = latest if end is None else min(end, latest)
+
+    summary = {"updated": [], "unchanged": [], "skipped": [], "failed": []}
+    fetched_any = False
+
+    for year in range(start, end + 1):
+        season_id = season_id_for(year)
+        outfile = DATA_DIR / f"standings_{season_id}.csv"
+        entry = manifest.get(season_id)
+        on_disk = file_sha256(outfile) if outfile.exists() else None
+
+        if entry and entry["final"] and entry["sha256"] == on_disk and not verify:
+            summary["skipped"].append(season_id)
+            continue
+
+        # Pause between API calls
+        if fetched_any:
+            time.sleep(1)
+        fetched_any = True
+
+        print(f"Fetching standings for {season_id}...")
+        try:
+            data = fetch_season_csv(season_id)
+        except Exception as e:
+            print(f"Failed {season_id}: {e}")
+            summary["failed"].append(season_id)
+            continue
+
+        digest = hashlib.sha256(data).hexdigest()
+        if digest == on_disk:
+            summary["unchanged"].append(season_id)
+            print(f"Unchanged {outfile}")
+        else:
+            atomic_write_bytes(outfile, data)
+            summary["updated"].append(season_id)
+            print(f"Saved → {outfile}")
+        _record(manifest, year, season_id, digest, now or datetime.now(timezone.utc))
+
+    print(
+        f"Sync done: {len(summary['updated'])} updated, {len(summary['unchanged'])} unchanged, "
+        f"{len(summary['skipped'])} skipped, {len(summary['failed'])} failed"
+    )
+    return summary
+
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument("--start", type=int, required=True)
-    parser.add_argument("--end", type=int, required=True)
+    parser.add_argument("--start", type=int)
+    parser.add_argument("--end", type=int)
     parser.add_argument("--type", type=str, required=True)
+    parser.add_argument("--sync", action="store_true",
+                        help="Only fetch seasons that are in progress, missing or changed")
+    parser.add_argument("--verify", action="store_true",
+                        help="With --sync, also re-check final seasons for upstream changes")
     args = parser.parse_args()
 
-    if args.type == "standings":
-        save_standings(args.start, args.end)
-    else:
+    if args.type != "standings":
         raise ValueError("Unknown type. Use: standings")
 
+    if args.sync:
+        summary = sync_standings(args.start, args.end, verify=args.verify)
+        if summary["failed"]:
+            raise SystemExit(1)
+    else:
+        if args.start is None or args.end is None:
+            parser.error("--start and --end are required unless --sync is given")
+        save_standings(args.start, args.end)
+
 if __name__ == "__main__":
     main()
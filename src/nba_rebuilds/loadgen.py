@@ -0,0 +1,139 @@
+"""Load generator for the local prediction server.
+
+Fires concurrent single-team ``/predict`` requests over keep-alive
+connections and reports p50/p99 latency and throughput.
+
+    # against a running server
+    uv run python -m nba_rebuilds.loadgen --port 8765 --concurrency 64 --requests 5000
+
+    # start in-process servers with and without batching and compare
+    uv run python -m nba_rebuilds.loadgen --compare --concurrency 64 --requests 5000
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from nba_rebuilds.predictor import PlayoffPredictor
+from nba_rebuilds.server import MicroBatcher, PredictionServer, encode_request, read_http_message
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+
+
+def load_sample_rows(feature_cols, n: int = 500) -> list:
+    """Real roster rows from the training data, as request payloads"""
+    df = pd.read_csv(DATA_DIR / "final_combined_file.csv")
+    df = df[feature_cols].dropna().head(n)
+    return df.to_dict(orient="records")
+
+
+async def _open(host, port, unix_path):
+    if unix_path:
+        return await asyncio.open_unix_connection(unix_path)
+    return await asyncio.open_connection(host, port)
+
+
+async def run_load(rows: list, host: str = "127.0.0.1", port: int = 8765, unix_path: str = None,
+                   concurrency: int = 32, total_requests: int = 2000) -> dict:
+    """Send ``total_requests`` predictions from ``concurrency`` clients"""
+    payloads = itertools.cycle(rows)
+    remaining = itertools.count()
+    latencies = []
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        reader, writer = await _open(host, port, unix_path)
+        try:
+            while next(remaining) < total_requests:
+                message = encode_request("POST", "/predict", next(payloads))
+                start = time.perf_counter()
+                writer.write(message)
+                await writer.drain()
+                status, _, _ = await read_http_message(reader, request=False)
+                latencies.append(time.perf_counter() - start)
+                if status != 200:
+                    errors += 1
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    lat_ms = np.asarray(latencies) * 1000
+    p50, p99 = np.percentile(lat_ms, [50, 99])
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": elapsed,
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_ms": float(p50),
+        "p99_ms": float(p99),
+    }
+
+
+async def compare(predictor: PlayoffPredictor, rows: list, concurrency: int, total_requests: int,
+                  max_batch: int, max_wait_ms: float) -> dict:
+    """Run the same load against in-process servers with batching off and on"""
+    configs = {
+        "unbatched": dict(max_batch=1, max_wait_ms=0.0),
+        "batched": dict(max_batch=max_batch, max_wait_ms=max_wait_ms),
+    }
+    results = {}
+    for name, config in configs.items():
+        server = await PredictionServer(MicroBatcher(predictor, **config)).start("127.0.0.1", 0)
+        try:
+            host, port = server.address[:2]
+            result = await run_load(rows, host, port, concurrency=concurrency, total_requests=total_requests)
+            result["mean_batch_size"] = server.stats()["mean_batch_size"]
+        finally:
+            await server.stop()
+        results[name] = result
+    return results
+
+
+def print_report(name: str, result: dict):
+    line = (f"{name:>10}: {result['requests']} req in {result['seconds']:.2f}s | "
+            f"{result['throughput_rps']:8.1f} req/s | p50 {result['p50_ms']:7.2f} ms | "
+            f"p99 {result['p99_ms']:7.2f} ms | errors {result['errors']}")
+    if "mean_batch_size" in result:
+        line += f" | mean batch {result['mean_batch_size']:.1f}"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for nba_rebuilds.server")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", type=str, default=None)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--compare", action="store_true",
+                        help="Start in-process servers and compare batching off vs on")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    if args.compare:
+        predictor = PlayoffPredictor()
+        rows = load_sample_rows(predictor.feature_cols)
+        results = asyncio.run(compare(predictor, rows, args.concurrency, args.requests,
+                                      args.max_batch, args.max_wait_ms))
+        for name, result in results.items():
+            print_report(name, result)
+    else:
+        feature_cols = joblib.load(DATA_DIR / "models" / "feature_columns.pkl")
+        rows = load_sample_rows(feature_cols)
+        result = asyncio.run(run_load(rows, args.host, args.port, args.unix,
+                                      args.concurrency, args.requests))
+        print_report("server", result)
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@ import joblib
 from pathlib import Path
 from typing import Dict, Union
 
+from .tree_shap import TreeShapExplainer
+
 class PlayoffPredictor:
     """Predict NBA playoff return time for teams"""
     
@@ -23,6 +25,7 @@ class PlayoffPredictor:
         self.model = joblib.load(model_path / "playoff_return_model.pkl")
         self.scaler = joblib.load(model_path / "feature_scaler.pkl")
         self.feature_cols = joblib.load(model_path / "feature_columns.pkl")
+        self._explainer = None
     
     def predict(self, team_data: Union[Dict, pd.DataFrame]) -> float:
         """
@@ -67,6 +70,39 @@ class PlayoffPredictor:
         X_scaled = self.scaler.transform(X)
         return self.model.predict(X_scaled)
     
+    def explain(self, team_data: Union[Dict, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Per-feature contributions to each prediction (exact TreeSHAP)
+        
+        Args:
+            team_data: Dictionary or DataFrame with one or more teams' features
+            
+        Returns:
+            DataFrame with one column per feature; each row sums to
+            that team's prediction minus ``expected_value``
+        """
+        if isinstance(team_data, dict):
+            team_data = pd.DataFrame([team_data])
+        
+        missing_features = set(self.feature_cols) - set(team_data.columns)
+        if missing_features:
+            raise ValueError(f"Missing required features: {missing_features}")
+        
+        X_scaled = self.scaler.transform(team_data[self.feature_cols])
+        values = self._get_explainer().shap_values(X_scaled)
+        return pd.DataFrame(values, columns=self.feature_cols, index=team_data.index)
+    
+    @property
+    def expected_value(self) -> float:
+        """Baseline prediction that ``explain`` contributions are measured from"""
+        return self._get_explainer().expected_value
+    
+    def _get_explainer(self) -> TreeShapExplainer:
+        # Built lazily: walking every tree is only needed once per model
+        if self._explainer is None:
+            self._explainer = TreeShapExplainer(self.model, len(self.feature_cols))
+        return self._explainer
+    
     def get_feature_importance(self) -> pd.DataFrame:
         """Get feature importance from the model"""
         if hasattr(self.model, 'feature_importances_'):
@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+
+from nba_rebuilds.fetch_data import season_id_for
+
+
+class TeamSeasonCube:
+    """Dense team x season standings with cumulative sums for O(1) window queries.
+
+    Seasons are indexed by NBA year (2021 = the 2020-21 season). Any
+    ``[start_year, end_year]`` aggregate is the difference of two prefix-sum
+    columns, so a window summary or a full rolling series never regroups rows.
+    """
+
+    def __init__(self, standings: pd.DataFrame):
+        """
+        Args:
+            standings: Multi-season standings with TeamName, Season or SeasonID,
+                Wins, Losses, WinPct and MadePlayoffs columns. Each team counts
+                once per season; if a (team, season) pair appears more than
+                once, the last row wins.
+        """
+        season_col = "SeasonID" if "SeasonID" in standings.columns else "Season"
+        standings = standings.drop_duplicates(subset=["TeamName", season_col], keep="last")
+        years = standings[season_col].str.split("-").str[0].astype(int).to_numpy() + 1
+
+        self.teams = np.array(sorted(standings["TeamName"].unique()))
+        self.first_year = int(years.min())
+        self.last_year = int(years.max())
+        n_teams, n_seasons = len(self.teams), self.last_year - self.first_year + 1
+
+        team_idx = np.searchsorted(self.teams, standings["TeamName"].to_numpy())
+        season_idx = years - self.first_year
+
+        def dense(values):
+            grid = np.zeros((n_teams, n_seasons))
+            grid[team_idx, season_idx] = values
+            return grid
+
+        present = dense(1.0)
+        per_season = {
+            "seasons": present,
+            "wins": dense(standings["Wins"].to_numpy(dtype=float)),
+            "losses": dense(standings["Losses"].to_numpy(dtype=float)),
+            "win_pct": dense(standings["WinPct"].to_numpy(dtype=float)),
+            "playoffs": dense(standings["MadePlayoffs"].to_numpy(dtype=float)),
+        }
+
+        # cum[name][:, k] is the total over seasons before index k
+        self.cum = {
+            name: np.concatenate([np.zeros((n_teams, 1)), grid.cumsum(axis=1)], axis=1)
+            for name, grid in per_season.items()
+        }
+
+        # Nearest season with data at or after / at or before each index
+        positions = np.broadcast_to(np.arange(n_seasons), present.shape)
+        has_data = present > 0
+        self._next_present = np.minimum.accumulate(
+            np.where(has_data, positions, n_seasons)[:, ::-1], axis=1
+        )[:, ::-1]
+        self._prev_present = np.maximum.accumulate(np.where(has_data, positions, -1), axis=1)
+
+    @property
+    def years(self) -> np.ndarray:
+        return np.arange(self.first_year, self.last_year + 1)
+
+    def _totals(self, lo, hi) -> dict:
+        """Sums over season indices [lo, hi) for each team; lo/hi may be arrays"""
+        return {name: cum[:, hi] - cum[:, lo] for name, cum in self.cum.items()}
+
+    def window(self, start_year: int, end_year: int) -> pd.DataFrame:
+        """
+        One row per team aggregated over NBA years ``start_year..end_year``
+
+        Returns:
+            DataFrame with TeamName, Seasons, AvgWins, AvgWinPct,
+            PlayoffAppearances, PlayoffRate, FirstSeason and LastSeason
+        """
+        lo = max(start_year, self.first_year) - self.first_year
+        hi = min(end_year, self.last_year) - self.first_year + 1
+        if hi <= lo:
+            return pd.DataFrame(columns=[
+                "TeamName", "Seasons", "AvgWins", "AvgWinPct",
+                "PlayoffAppearances", "PlayoffRate", "FirstSeason", "LastSeason",
+            ])
+
+        totals = self._totals(lo, hi)
+        seasons = totals["seasons"]
+        keep = seasons > 0
+        seasons = seasons[keep]
+
+        first = self._next_present[keep, lo] + self.first_year
+        last = self._prev_present[keep, hi - 1] + self.first_year
+        return (
+            pd.DataFrame({
+                "TeamName": self.teams[keep],
+                "Seasons": seasons.astype(int),
+                "AvgWins": totals["wins"][keep] / seasons,
+                "AvgWinPct": totals["win_pct"][keep] / seasons,
+                "PlayoffAppearances": totals["playoffs"][keep].astype(int),
+                "PlayoffRate": totals["playoffs"][keep] / seasons,
+                "FirstSeason": [season_id_for(y) for y in first],
+                "LastSeason": [season_id_for(y) for y in last],
+            })
+            .sort_values("AvgWinPct", ascending=False)
+            .reset_index(drop=True)
+        )
+
+    def rolling(self, window: int, min_seasons: int = None) -> pd.DataFrame:
+        """
+        Trailing ``window``-season aggregates for every team and every end season
+
+        Args:
+            window: Number of seasons in each window
+            min_seasons: Minimum seasons with data for a window to be reported
+                (defaults to ``window``, i.e. complete windows only)
+
+        Returns:
+            Long DataFrame with TeamName, Year, SeasonID (window end), Seasons,
+            WinPct (wins / games) and PlayoffRate
+        """
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        min_seasons = window if min_seasons is None else min_seasons
+
+        n_seasons = self.last_year - self.first_year + 1
+        if window > n_seasons:
+            return pd.DataFrame(columns=["TeamName", "Year", "SeasonID", "Seasons", "WinPct", "PlayoffRate"])
+
+        # Window ending at index j covers [j - window + 1, j]
+        hi = np.arange(window, n_seasons + 1)
+        totals = self._totals(hi - window, hi)
+        seasons = totals["seasons"]
+        games = totals["wins"] + totals["losses"]
+
+        end_years = np.broadcast_to(self.first_year + hi - 1, seasons.shape)
+        teams = np.broadcast_to(self.teams[:, None], seasons.shape)
+        keep = seasons >= max(min_seasons, 1)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            win_pct = totals["wins"] / games
+            playoff_rate = totals["playoffs"] / seasons
+
+        return pd.DataFrame({
+            "TeamName": teams[keep],
+            "Year": end_years[keep],
+            "SeasonID": [season_id_for(y) for y in end_years[keep]],
+            "Seasons": seasons[keep].astype(int),
+            "WinPct": win_pct[keep],
+            "PlayoffRate": playoff_rate[keep],
+        })
@@ -0,0 +1,426 @@
+"""Local micro-batching prediction server for PlayoffPredictor.
+
+Loads the model once and coalesces concurrent single-team requests into
+``predict_batch`` calls. Speaks a minimal HTTP/1.1 (keep-alive, JSON bodies)
+over TCP or a Unix socket, localhost only.
+
+    uv run python -m nba_rebuilds.server --port 8765 --max-batch 64 --max-wait-ms 2
+
+Endpoints:
+    POST /predict  JSON object of team features -> {"prediction": float}
+    GET  /health   model status
+    GET  /stats    request/batch counters and latency percentiles
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from nba_rebuilds.predictor import PlayoffPredictor
+
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable",
+}
+# Largest request body accepted; one team's features is well under 1 KiB
+MAX_BODY_BYTES = 64 * 1024
+
+
+class RequestError(ValueError):
+    """Unreadable HTTP message, answered with ``status`` before closing"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ServerStats:
+    """Rolling request/batch counters and latency window"""
+
+    def __init__(self, window: int = 10000):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched_rows = 0
+        self.max_batch_seen = 0
+        self.latencies = deque(maxlen=window)
+
+    def record_batch(self, size: int):
+        self.batches += 1
+        self.batched_rows += size
+        self.max_batch_seen = max(self.max_batch_seen, size)
+
+    def record_request(self, latency: float, ok: bool = True):
+        self.requests += 1
+        if not ok:
+            self.errors += 1
+        self.latencies.append(latency)
+
+    def snapshot(self) -> dict:
+        uptime = time.perf_counter() - self.started
+        if self.latencies:
+            lat_ms = np.asarray(self.latencies) * 1000
+            p50, p90, p99 = np.percentile(lat_ms, [50, 90, 99])
+            latency = {"p50": p50, "p90": p90, "p99": p99, "max": lat_ms.max()}
+        else:
+            latency = {"p50": None, "p90": None, "p99": None, "max": None}
+        return {
+            "uptime_s": round(uptime, 3),
+            "requests": self.requests,
+            "errors": self.errors,
+            "batches": self.batches,
+            "mean_batch_size": self.batched_rows / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_seen,
+            "throughput_rps": self.requests / uptime if uptime > 0 else 0.0,
+            "latency_ms": {k: None if v is None else round(float(v), 3) for k, v in latency.items()},
+        }
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-row predictions into batched calls"""
+
+    def __init__(self, predictor: PlayoffPredictor, max_batch: int = 64, max_wait_ms: float = 2.0):
+        """
+        Args:
+            predictor: Loaded PlayoffPredictor shared by all requests
+            max_batch: Largest number of rows sent to one predict_batch call
+            max_wait_ms: Longest time the first queued row waits for company
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch must be >= 1")
+        self.predictor = predictor
+        self.max_batch = max_batch
+        self.max_wait = max(max_wait_ms, 0.0) / 1000
+        self.stats = ServerStats()
+        self._queue = None
+        self._worker = None
+        self._executor = None
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        # One thread keeps the event loop free while a batch is in sklearn
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the worker and fail any requests still waiting for a batch"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._queue is not None:
+            while not self._queue.empty():
+                self._fail([self._queue.get_nowait()], ConnectionError("server stopping"))
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        # New submissions fail fast until start() is called again
+        self._queue = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def submit(self, team_data: dict) -> float:
+        """Queue one team's features and wait for its prediction"""
+        start = time.perf_counter()
+        if self._queue is None:
+            self.stats.record_request(time.perf_counter() - start, ok=False)
+            raise ConnectionError("server stopping")
+        try:
+            row = self._validate(team_data)
+        except ValueError:
+            self.stats.record_request(time.perf_counter() - start, ok=False)
+            raise
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future))
+        try:
+            prediction = await future
+        except Exception:
+            self.stats.record_request(time.perf_counter() - start, ok=False)
+            raise
+        self.stats.record_request(time.perf_counter() - start)
+        return prediction
+
+    def _validate(self, team_data: dict) -> dict:
+        """Reject bad rows up front so they never share a batch with good ones"""
+        missing_features = set(self.predictor.feature_cols) - set(team_data)
+        if missing_features:
+            raise ValueError(f"Missing required features: {missing_features}")
+
+        row = {}
+        for feature in self.predictor.feature_cols:
+            value = team_data[feature]
+            try:
+                if isinstance(value, bool):
+                    raise TypeError
+                row[feature] = float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Feature {feature!r} must be a number, got {value!r}") from None
+            if not np.isfinite(row[feature]):
+                raise ValueError(f"Feature {feature!r} must be finite, got {value!r}")
+        return row
+
+    def _predict(self, rows: list) -> np.ndarray:
+        return self.predictor.predict_batch(pd.DataFrame(rows, columns=self.predictor.feature_cols))
+
+    async def _collect(self) -> list:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+            except asyncio.CancelledError:
+                self._fail(batch, ConnectionError("server stopping"))
+                raise
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            self.stats.record_batch(len(batch))
+            try:
+                await self._resolve(batch)
+            except asyncio.CancelledError:
+                self._fail(batch, ConnectionError("server stopping"))
+                raise
+
+    async def _resolve(self, batch: list):
+        loop = asyncio.get_running_loop()
+        rows = [row for row, _ in batch]
+        try:
+            predictions = await loop.run_in_executor(self._executor, self._predict, rows)
+        except Exception as e:
+            if len(batch) == 1:
+                self._fail(batch, e)
+                return
+            # Retry row by row so only the offending request sees the error
+            for item in batch:
+                await self._resolve([item])
+            return
+        for (_, future), prediction in zip(batch, predictions):
+            if not future.done():
+                future.set_result(float(prediction))
+
+    @staticmethod
+    def _fail(batch: list, error: Exception):
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+
+class PredictionServer:
+    """Minimal keep-alive HTTP/1.1 front end for a MicroBatcher"""
+
+    def __init__(self, batcher: MicroBatcher):
+        self.batcher = batcher
+        self._server = None
+        # Open connection handler tasks and their writers
+        self._connections = {}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765, unix_path: str = None):
+        """Start listening; port 0 picks a free port (see ``address``)"""
+        self.batcher.start()
+        if unix_path:
+            self._server = await asyncio.start_unix_server(self._handle, path=unix_path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+        return self
+
+    @property
+    def address(self):
+        return self._server.sockets[0].getsockname()
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        """Stop listening, drop open keep-alive connections and stop the batcher"""
+        if self._server is not None:
+            self._server.close()
+            # wait_closed() also waits for open connections, so close them first
+            handlers = list(self._connections)
+            for task, writer in self._connections.items():
+                writer.close()
+                task.cancel()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self._server.wait_closed()
+        await self.batcher.stop()
+
+    def health(self) -> dict:
+        predictor = self.batcher.predictor
+        return {
+            "status": "ok",
+            "model": type(predictor.model).__name__,
+            "n_features": len(predictor.feature_cols),
+            "max_batch": self.batcher.max_batch,
+            "max_wait_ms": self.batcher.max_wait * 1000,
+        }
+
+    def stats(self) -> dict:
+        stats = self.batcher.stats.snapshot()
+        stats["queue_depth"] = self.batcher.queue_depth
+        return stats
+
+    async def _route(self, method: str, path: str, body: bytes):
+        path = path.split("?", 1)[0]
+        if path == "/health":
+            return (200, self.health()) if method == "GET" else (405, {"error": "use GET"})
+        if path == "/stats":
+            return (200, self.stats()) if method == "GET" else (405, {"error": "use GET"})
+        if path == "/predict":
+            if method != "POST":
+                return 405, {"error": "use POST"}
+            try:
+                team_data = json.loads(body)
+            except ValueError:
+                return 400, {"error": "body must be JSON"}
+            if not isinstance(team_data, dict):
+                return 400, {"error": "body must be a JSON object of team features"}
+            try:
+                prediction = await self.batcher.submit(team_data)
+            except ValueError as e:
+                return 400, {"error": str(e)}
+            except ConnectionError as e:
+                return 503, {"error": str(e)}
+            except Exception as e:
+                return 500, {"error": str(e)}
+            return 200, {"prediction": prediction}
+        return 404, {"error": f"unknown path {path}"}
+
+    async def _handle(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                request = await read_http_message(reader, request=True)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                status, payload = await self._route(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(encode_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except RequestError as e:
+            # The rest of the stream can't be framed, so answer and close
+            writer.write(encode_response(e.status, {"error": str(e)}, keep_alive=False))
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+
+async def read_http_message(reader, request: bool = True):
+    """Read one HTTP/1.1 request (or response) with a Content-Length body
+
+    Returns ``(method, path, headers, body)`` for requests,
+    ``(status, headers, body)`` for responses, or None on a clean EOF.
+    Raises RequestError for a malformed start line or Content-Length, or
+    a body larger than MAX_BODY_BYTES.
+    """
+    start_line = await reader.readline()
+    if not start_line:
+        return None
+    parts = start_line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+    if len(parts) < 2:
+        raise RequestError(400, f"Malformed HTTP start line: {start_line!r}")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    raw_length = headers.get("content-length", "0")
+    if not (raw_length.isascii() and raw_length.isdigit()):
+        raise RequestError(400, f"Invalid Content-Length: {raw_length!r}")
+    length = int(raw_length)
+    if length > MAX_BODY_BYTES:
+        raise RequestError(413, f"Body of {length} bytes exceeds {MAX_BODY_BYTES}")
+    body = await reader.readexactly(length) if length else b""
+    if request:
+        return parts[0].upper(), parts[1], headers, body
+    return int(parts[1]), headers, body
+
+
+def encode_response(status: int, payload: dict, keep_alive: bool = True) -> bytes:
+    body = json.dumps(payload).encode()
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+def encode_request(method: str, path: str, payload: dict = None, host: str = "localhost") -> bytes:
+    body = json.dumps(payload).encode() if payload is not None else b""
+    head = (
+        f"{method} {path} HTTP/1.1\r\n"
+        f"Host: {host}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def _serve(args):
+    predictor = PlayoffPredictor(args.model_path)
+    batcher = MicroBatcher(predictor, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+    server = await PredictionServer(batcher).start(args.host, args.port, args.unix)
+    print(f"Serving predictions on {args.unix or server.address} "
+          f"(max_batch={args.max_batch}, max_wait_ms={args.max_wait_ms})")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local micro-batching PlayoffPredictor server")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", type=str, default=None, help="Listen on a Unix socket path instead of TCP")
+    parser.add_argument("--model-path", type=str, default=None)
+    parser.add_argument("--max-batch", type=int, default=64, help="Use 1 to disable batching")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Exact path-dependent TreeSHAP for sklearn tree ensembles.
+
+Each leaf of each tree contributes independently. For a leaf with unique path
+features U, let z_j be the fraction of training cover that follows the path's
+splits on feature j, and o_j be 1 if the row satisfies those splits (else 0).
+The leaf's Shapley contribution to feature i is
+
+    v * (o_i - z_i) * sum_{S ⊆ U\\{i}} |S|!(|U|-|S|-1)!/|U|! * prod_{S} o_j * prod_{U\\S\\{i}} z_j
+
+The inner sum is a weighted read-out of the polynomial prod_{j != i}(z_j + o_j t),
+so every leaf costs O(depth^2) and all leaves of all trees are evaluated at
+once as padded numpy arrays, vectorized over a batch of rows.
+
+Because o_j is binary, a leaf's contributions depend only on which of its path
+features are "hot". For shallow ensembles the contributions of every hot/cold
+pattern are precomputed once, and explaining a row reduces to one gather per
+leaf; deeper trees fall back to evaluating the polynomials per row.
+"""
+
+import numpy as np
+from math import factorial
+
+# Elements per intermediate (rows x leaves x slots) array before chunking rows
+_CHUNK_ELEMENTS = 1 << 21
+# Largest (leaves x 2^slots x slots) pattern table built up front
+_TABLE_ELEMENTS = 1 << 23
+
+
+def _ensemble_trees(model, n_features: int):
+    """Return ``(trees, weights, offset)`` so that predict = offset + sum(w * tree)"""
+    if hasattr(model, "tree_"):
+        return [model], [1.0], 0.0
+    if hasattr(model, "estimators_") and hasattr(model, "learning_rate"):
+        # Gradient boosting: init estimator + learning_rate * sum of stage trees
+        trees = [est for est in np.ravel(model.estimators_)]
+        if model.init_ == "zero":
+            offset = 0.0
+        else:
+            offset = float(np.ravel(model.init_.predict(np.zeros((1, n_features))))[0])
+        return trees, [model.learning_rate] * len(trees), offset
+    if hasattr(model, "estimators_"):
+        # Random forest / extra trees: mean of trees
+        trees = list(model.estimators_)
+        return trees, [1.0 / len(trees)] * len(trees), 0.0
+    raise TypeError(f"Unsupported model type for TreeSHAP: {type(model).__name__}")
+
+
+def _leaf_paths(tree):
+    """Yield ``(leaf_value, [(feature, threshold, goes_left, cover_ratio), ...])``"""
+    t = tree.tree_
+    left, right = t.children_left, t.children_right
+    cover = t.weighted_n_node_samples
+    stack = [(0, [])]
+    while stack:
+        node, path = stack.pop()
+        if left[node] == right[node]:
+            yield float(t.value[node].ravel()[0]), path
+            continue
+        feature, threshold = int(t.feature[node]), float(t.threshold[node])
+        for child, goes_left in ((left[node], True), (right[node], False)):
+            edge = (feature, threshold, goes_left, cover[child] / cover[node])
+            stack.append((child, path + [edge]))
+
+
+class TreeShapExplainer:
+    """Per-row feature contributions for a fitted sklearn tree model"""
+
+    def __init__(self, model, n_features: int):
+        """
+        Args:
+            model: Fitted DecisionTree, RandomForest or GradientBoosting regressor
+            n_features: Number of input columns the model was trained on
+        """
+        trees, tree_weights, offset = _ensemble_trees(model, n_features)
+
+        leaves = []
+        for tree, weight in zip(trees, tree_weights):
+            for value, path in _leaf_paths(tree):
+                leaves.append((weight * value, path))
+
+        n_leaves = len(leaves)
+        depth = max(1, max(len(path) for _, path in leaves))
+        slots = max(1, max(len({f for f, *_ in path}) for _, path in leaves))
+
+        # Path edges, padded to the deepest leaf with always-followed "x <= inf"
+        self.edge_feature = np.zeros((n_leaves, depth), dtype=np.intp)
+        self.edge_threshold = np.full((n_leaves, depth), np.inf)
+        self.edge_left = np.ones((n_leaves, depth), dtype=bool)
+        self.edge_bit = np.zeros((n_leaves, depth), dtype=np.int64)
+
+        # Unique features per leaf ("slots"); padded slots are the neutral factor 1
+        self.slot_zero = np.ones((n_leaves, slots))
+        self.slot_valid = np.zeros((n_leaves, slots), dtype=bool)
+        self.leaf_bits = np.zeros(n_leaves, dtype=np.int64)
+        self.slot_weights = np.zeros((n_leaves, slots))
+        self.leaf_map = np.zeros((n_leaves * slots, n_features))
+
+        expected_value = offset
+        for leaf, (value, path) in enumerate(leaves):
+            slot_of = {}
+            for d, (feature, threshold, goes_left, ratio) in enumerate(path):
+                slot = slot_of.setdefault(feature, len(slot_of))
+                self.edge_feature[leaf, d] = feature
+                self.edge_threshold[leaf, d] = threshold
+                self.edge_left[leaf, d] = goes_left
+                self.edge_bit[leaf, d] = 1 << slot
+                self.slot_zero[leaf, slot] *= ratio
+
+            k = len(slot_of)
+            self.slot_valid[leaf, :k] = True
+            self.leaf_bits[leaf] = (1 << k) - 1
+            for s in range(k):
+                self.slot_weights[leaf, s] = factorial(s) * factorial(k - s - 1) / factorial(k)
+            for feature, slot in slot_of.items():
+                self.leaf_map[leaf * slots + slot, feature] = value
+            expected_value += value * self.slot_zero[leaf].prod()
+
+        self.expected_value = expected_value
+        self.n_features = n_features
+        self._rows_per_chunk = max(1, _CHUNK_ELEMENTS // (n_leaves * (slots + 1)))
+
+        self._slot_bits = 1 << np.arange(slots, dtype=np.int64)
+        self._table = None
+        if n_leaves * (1 << slots) * slots <= _TABLE_ELEMENTS:
+            self._table = self._build_table()
+
+    def _build_table(self) -> np.ndarray:
+        """Contributions for every hot/cold pattern, flattened to (leaves * 2^slots, slots)"""
+        n_leaves, slots = self.slot_zero.shape
+        n_patterns = 1 << slots
+        patterns = np.broadcast_to(np.arange(n_patterns)[:, None], (n_patterns, n_leaves))
+        table = np.empty((n_leaves, n_patterns, slots))
+        for start in range(0, n_patterns, self._rows_per_chunk):
+            stop = start + self._rows_per_chunk
+            contrib = self._leaf_contributions(self._hot_mask(patterns[start:stop]))
+            table[:, start:stop] = contrib.transpose(1, 0, 2)
+        return table.reshape(n_leaves * n_patterns, slots)
+
+    def _hot_mask(self, patterns: np.ndarray) -> np.ndarray:
+        """Expand (rows, leaves) bit patterns to a (rows, leaves, slots) bool mask"""
+        return ((patterns & self.leaf_bits)[..., None] & self._slot_bits).astype(bool)
+
+    def shap_values(self, X) -> np.ndarray:
+        """
+        Compute exact path-dependent SHAP values
+
+        Args:
+            X: Array of shape (n_rows, n_features), in the model's input space
+
+        Returns:
+            Array of shape (n_rows, n_features); each row sums to
+            prediction - expected_value
+        """
+        # Trees compare float32 inputs against their thresholds
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+        out = np.empty((X.shape[0], self.n_features))
+        for start in range(0, X.shape[0], self._rows_per_chunk):
+            stop = start + self._rows_per_chunk
+            out[start:stop] = self._shap_chunk(X[start:stop])
+        return out
+
+    def _shap_chunk(self, X: np.ndarray) -> np.ndarray:
+        n_rows = X.shape[0]
+        n_leaves, slots = self.slot_zero.shape
+
+        # Bit j of a leaf's pattern is o_j: the row follows every split the
+        # leaf's path makes on its j-th feature
+        follows = (X[:, self.edge_feature] <= self.edge_threshold) == self.edge_left
+        failed = np.bitwise_or.reduce(np.where(follows, 0, self.edge_bit), axis=2)
+        patterns = self.leaf_bits & ~failed
+
+        if self._table is not None:
+            index = np.arange(n_leaves) * (1 << slots) + patterns
+            contrib = self._table[index]
+        else:
+            contrib = self._leaf_contributions(self._hot_mask(patterns))
+        return contrib.reshape(n_rows, n_leaves * slots) @ self.leaf_map
+
+    def _leaf_contributions(self, hot: np.ndarray) -> np.ndarray:
+        """Unscaled per-slot contributions for hot masks of shape (rows, leaves, slots)"""
+        n_rows, n_leaves, slots = hot.shape
+        one = hot.astype(np.float64)
+        zero = self.slot_zero
+
+        # Coefficients of prod_j (z_j + o_j t), lowest degree first
+        poly = np.zeros((n_rows, n_leaves, slots + 1))
+        poly[..., 0] = 1.0
+        for j in range(slots):
+            grown = poly * zero[:, j, None]
+            grown[..., 1:] += one[..., j, None] * poly[..., :-1]
+            poly = grown
+
+        contrib = np.empty((n_rows, n_leaves, slots))
+        for i in range(slots):
+            z_i = zero[:, i]
+            # Divide factor i back out: by z_i when cold, by (z_i + t) when hot
+            cold = poly[..., :slots] / z_i[:, None]
+            warm = np.empty_like(cold)
+            carry = np.zeros((n_rows, n_leaves))
+            for m in range(slots, 0, -1):
+                carry = poly[..., m] - z_i * carry
+                warm[..., m - 1] = carry
+            quotient = np.where(hot[..., i, None], warm, cold)
+            weighted = np.einsum("nls,ls->nl", quotient, self.slot_weights)
+            contrib[..., i] = (one[..., i] - z_i) * weighted
+        return contrib
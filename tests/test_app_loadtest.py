@@ -0,0 +1,47 @@
+import threading
+
+from nba_rebuilds import fetch_data
+from nba_rebuilds.app_loadtest import ScriptThreadErrors, check_budgets, run_load_test
+
+
+def test_load_test_runs_offline():
+    data_dir = fetch_data.DATA_DIR
+    report = run_load_test(sessions=2, iterations=1, pages=("analyzer", "predictor"), start=2015, end=2020)
+
+    assert report["errors"] == []
+    assert set(report["pages"]) == {"analyzer", "predictor"}
+    assert report["steps"]["predictor/predict"]["count"] == 1
+    assert report["caches"]["load_model"]["lookups"] == 3
+    assert fetch_data.DATA_DIR == data_dir
+
+    assert check_budgets(report, {"max_errors": 0}) == []
+    assert check_budgets(report, {"p99_ms": 0.001, "max_errors": 0})
+
+
+def test_load_test_smallest_span():
+    report = run_load_test(sessions=1, iterations=2, pages=("analyzer",), start=2015, end=2017)
+
+    assert report["errors"] == []
+    assert report["steps"]["analyzer/change_years"]["count"] == 2
+
+
+def test_many_sessions_do_not_break_each_other():
+    report = run_load_test(sessions=5, iterations=1, pages=("analyzer", "predictor"), start=2015, end=2020)
+
+    assert report["errors"] == []
+    # 3 analyzer sessions x (initial + 4 steps) + 2 predictor sessions x (initial + 2 steps)
+    assert report["reruns"] == 21
+
+
+def test_script_thread_crash_is_collected():
+    def crash():
+        raise RuntimeError("Runtime hasn't been created!")
+
+    with ScriptThreadErrors().installed() as thread_errors:
+        thread = threading.Thread(target=crash, name="ScriptRunner.scriptThread")
+        thread.start()
+        thread.join()
+
+    assert thread_errors.errors == [
+        "RuntimeError: Runtime hasn't been created! (in ScriptRunner.scriptThread)"
+    ]
@@ -0,0 +1,92 @@
+import os
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+from nba_rebuilds import fetch_data
+
+
+@pytest.fixture
+def fake_api(tmp_path, monkeypatch):
+    calls = []
+    wins = {}
+
+    def get_standings(season):
+        calls.append(season)
+        return pd.DataFrame({
+            "TeamName": ["A", "B"],
+            "Conference": ["East", "West"],
+            "Wins": [wins.get(season, 50), 30],
+            "Losses": [32, 52],
+            "WinPct": [0.6, 0.4],
+        })
+
+    monkeypatch.setattr(fetch_data, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(fetch_data, "get_standings", get_standings)
+    monkeypatch.setattr(fetch_data.time, "sleep", lambda _: None)
+    return calls, wins
+
+
+def test_sync_skips_final_seasons_and_refetches_current(fake_api, tmp_path):
+    calls, wins = fake_api
+    now = datetime(2026, 1, 15, tzinfo=timezone.utc)
+
+    summary = fetch_data.sync_standings(2023, now=now)
+    assert calls == ["2022-23", "2023-24", "2024-25", "2025-26"]
+    assert summary["updated"] == calls
+    assert (tmp_path / "standings_2025-26.csv").exists()
+    assert not list(tmp_path.glob("*.tmp"))
+
+    calls.clear()
+    wins["2025-26"] = 51
+    summary = fetch_data.sync_standings(now=now)
+    assert calls == ["2025-26"]
+    assert summary["updated"] == ["2025-26"]
+    assert summary["skipped"] == ["2022-23", "2023-24", "2024-25"]
+
+    # A final season whose file was lost is fetched again
+    (tmp_path / "standings_2023-24.csv").unlink()
+    calls.clear()
+    summary = fetch_data.sync_standings(now=now)
+    assert calls == ["2023-24", "2025-26"]
+    assert summary["unchanged"] == ["2025-26"]
+
+
+def test_sync_resumes_after_failure(fake_api, monkeypatch):
+    calls, _ = fake_api
+    now = datetime(2026, 1, 15, tzinfo=timezone.utc)
+    working = fetch_data.get_standings
+
+    def flaky(season):
+        if season == "2024-25":
+            raise ConnectionError("timeout")
+        return working(season)
+
+    monkeypatch.setattr(fetch_data, "get_standings", flaky)
+    summary = fetch_data.sync_standings(2024, now=now)
+    assert summary["failed"] == ["2024-25"]
+
+    monkeypatch.setattr(fetch_data, "get_standings", working)
+    calls.clear()
+    summary = fetch_data.sync_standings(2024, now=now)
+    assert calls == ["2024-25", "2025-26"]
+    assert summary["skipped"] == ["2023-24"]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+def test_atomic_write_keeps_normal_file_mode(tmp_path):
+    old_umask = os.umask(0o022)
+    try:
+        new_file = tmp_path / "new.csv"
+        fetch_data.atomic_write_bytes(new_file, b"a")
+        assert new_file.stat().st_mode & 0o777 == 0o644
+
+        existing = tmp_path / "existing.csv"
+        existing.write_bytes(b"old")
+        existing.chmod(0o640)
+        fetch_data.atomic_write_bytes(existing, b"new")
+        assert existing.stat().st_mode & 0o777 == 0o640
+        assert existing.read_bytes() == b"new"
+    finally:
+        os.umask(old_umask)
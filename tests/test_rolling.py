@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nba_rebuilds.rolling import TeamSeasonCube
+
+
+@pytest.fixture
+def standings():
+    rng = np.random.default_rng(0)
+    rows = []
+    for year in range(2010, 2024):
+        for team in "ABCDEF":
+            # Team F has a gap in its history
+            if team == "F" and year in (2013, 2014):
+                continue
+            wins = int(rng.integers(15, 65))
+            rows.append({
+                "TeamName": team,
+                "Wins": wins,
+                "Losses": 82 - wins,
+                "WinPct": wins / 82,
+                "MadePlayoffs": int(wins > 41),
+                "SeasonID": f"{year - 1}-{str(year)[-2:]}",
+            })
+    return pd.DataFrame(rows)
+
+
+def test_window_matches_groupby(standings):
+    cube = TeamSeasonCube(standings)
+    subset = standings[standings["SeasonID"].between("2012-13", "2016-17")]
+    expected = (
+        subset.groupby("TeamName")
+        .agg(
+            Seasons=("SeasonID", "nunique"),
+            AvgWins=("Wins", "mean"),
+            AvgWinPct=("WinPct", "mean"),
+            PlayoffAppearances=("MadePlayoffs", "sum"),
+            PlayoffRate=("MadePlayoffs", "mean"),
+            FirstSeason=("SeasonID", "min"),
+            LastSeason=("SeasonID", "max"),
+        )
+        .reset_index()
+        .sort_values("AvgWinPct", ascending=False)
+        .reset_index(drop=True)
+    )
+    pd.testing.assert_frame_equal(cube.window(2013, 2017), expected, check_dtype=False)
+
+
+def test_rolling_matches_recomputed_windows(standings):
+    cube = TeamSeasonCube(standings)
+    rolling = cube.rolling(3).set_index(["TeamName", "Year"])
+
+    for (team, year), row in rolling.iterrows():
+        seasons = [f"{y - 1}-{str(y)[-2:]}" for y in range(year - 2, year + 1)]
+        games = standings[(standings["TeamName"] == team) & standings["SeasonID"].isin(seasons)]
+        assert row["Seasons"] == 3
+        assert row["WinPct"] == pytest.approx(games["Wins"].sum() / (games["Wins"] + games["Losses"]).sum())
+        assert row["PlayoffRate"] == pytest.approx(games["MadePlayoffs"].mean())
+
+    # Windows overlapping team F's missing seasons are incomplete
+    assert not rolling.loc["F"].index.isin([2013, 2014, 2015, 2016]).any()
+    assert len(cube.rolling(3, min_seasons=1)) > len(rolling)
+
+
+def test_duplicate_rows_count_once(standings):
+    duplicated = pd.concat([standings, standings[standings["SeasonID"] == "2014-15"]], ignore_index=True)
+    pd.testing.assert_frame_equal(
+        TeamSeasonCube(duplicated).window(2012, 2018), TeamSeasonCube(standings).window(2012, 2018)
+    )
@@ -0,0 +1,159 @@
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from nba_rebuilds.loadgen import load_sample_rows, run_load
+from nba_rebuilds.predictor import PlayoffPredictor
+from nba_rebuilds.server import MicroBatcher, PredictionServer, encode_request, read_http_message
+
+
+@pytest.fixture(scope="module")
+def predictor():
+    return PlayoffPredictor()
+
+
+def test_batched_predictions_match_predict_batch(predictor):
+    rows = load_sample_rows(predictor.feature_cols, n=50)
+
+    async def run():
+        batcher = MicroBatcher(predictor, max_batch=16, max_wait_ms=5)
+        batcher.start()
+        try:
+            results = await asyncio.gather(*(batcher.submit(row) for row in rows))
+        finally:
+            await batcher.stop()
+        return results, batcher.stats.snapshot()
+
+    results, stats = asyncio.run(run())
+    expected = predictor.predict_batch(pd.DataFrame(rows))
+    np.testing.assert_allclose(results, expected)
+    assert stats["requests"] == 50
+    assert stats["max_batch_size"] <= 16
+    assert stats["batches"] < 50
+
+
+def test_server_roundtrip(predictor):
+    rows = load_sample_rows(predictor.feature_cols, n=20)
+
+    async def run():
+        server = await PredictionServer(MicroBatcher(predictor)).start("127.0.0.1", 0)
+        try:
+            host, port = server.address[:2]
+            result = await run_load(rows, host, port, concurrency=4, total_requests=40)
+            return result, server.stats()
+        finally:
+            await server.stop()
+
+    result, stats = asyncio.run(run())
+    assert result["requests"] == 40
+    assert result["errors"] == 0
+    assert stats["requests"] == 40
+
+
+async def _submit_all(predictor, rows):
+    batcher = MicroBatcher(predictor, max_batch=16, max_wait_ms=20)
+    batcher.start()
+    try:
+        results = await asyncio.gather(*(batcher.submit(row) for row in rows), return_exceptions=True)
+        return results, batcher.stats.snapshot()
+    finally:
+        await batcher.stop()
+
+
+def test_bad_row_does_not_fail_its_batch(predictor, monkeypatch):
+    rows = load_sample_rows(predictor.feature_cols, n=8)
+    expected = predictor.predict_batch(pd.DataFrame(rows))
+
+    # Invalid values and missing features are rejected before batching
+    bad_type = dict(rows[0], avg_age="abc")
+    missing = {"avg_age": 25.0}
+    results, stats = asyncio.run(_submit_all(predictor, rows + [bad_type, missing]))
+    np.testing.assert_allclose(results[:8], expected)
+    assert all(isinstance(r, ValueError) for r in results[8:])
+    assert stats["errors"] == 2
+
+    # A failure inside predict_batch is retried row by row
+    original = predictor.predict_batch
+
+    def fails_on_marker(df):
+        if (df["avg_age"] == 99.0).any():
+            raise ValueError("bad row")
+        return original(df)
+
+    monkeypatch.setattr(predictor, "predict_batch", fails_on_marker)
+    results, stats = asyncio.run(_submit_all(predictor, rows + [dict(rows[0], avg_age=99.0)]))
+    np.testing.assert_allclose(results[:8], expected)
+    assert isinstance(results[8], ValueError)
+    assert stats["errors"] == 1
+
+
+def test_stop_fails_queued_requests_and_restarts(predictor):
+    rows = load_sample_rows(predictor.feature_cols, n=4)
+
+    async def run():
+        batcher = MicroBatcher(predictor, max_batch=1, max_wait_ms=0)
+        batcher.start()
+        pending = [asyncio.ensure_future(batcher.submit(row)) for row in rows]
+        await asyncio.sleep(0)
+        await batcher.stop()
+        stopped = await asyncio.wait_for(asyncio.gather(*pending, return_exceptions=True), 5)
+
+        batcher.start()
+        try:
+            restarted = await batcher.submit(rows[0])
+        finally:
+            await batcher.stop()
+        return stopped, restarted
+
+    stopped, restarted = asyncio.run(run())
+    assert any(isinstance(r, ConnectionError) for r in stopped)
+    assert restarted == pytest.approx(predictor.predict_batch(pd.DataFrame(rows[:1]))[0])
+
+
+def test_stop_closes_keep_alive_connections(predictor):
+    rows = load_sample_rows(predictor.feature_cols, n=1)
+
+    async def run():
+        batcher = MicroBatcher(predictor)
+        server = await PredictionServer(batcher).start("127.0.0.1", 0)
+        host, port = server.address[:2]
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(encode_request("POST", "/predict", rows[0]))
+        await writer.drain()
+        status, _, _ = await read_http_message(reader, request=False)
+
+        # The idle keep-alive client must not keep stop() waiting
+        await asyncio.wait_for(server.stop(), 5)
+        closed = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+
+        with pytest.raises(ConnectionError):
+            await asyncio.wait_for(batcher.submit(rows[0]), 5)
+        return status, closed
+
+    status, closed = asyncio.run(run())
+    assert status == 200
+    assert closed == b""
+
+
+@pytest.mark.parametrize("length, status", [("abc", 400), ("-5", 400), ("10000000", 413)])
+def test_bad_content_length_gets_a_response(predictor, length, status):
+    async def run():
+        server = await PredictionServer(MicroBatcher(predictor)).start("127.0.0.1", 0)
+        try:
+            reader, writer = await asyncio.open_connection(*server.address[:2])
+            writer.write(f"POST /predict HTTP/1.1\r\nContent-Length: {length}\r\n\r\n{{}}".encode())
+            await writer.drain()
+            response = await asyncio.wait_for(read_http_message(reader, request=False), 5)
+            writer.close()
+            return response
+        finally:
+            await server.stop()
+
+    code, headers, body = asyncio.run(run())
+    assert code == status
+    assert headers["connection"] == "close"
+    assert "error" in json.loads(body)
@@ -0,0 +1,89 @@
+import itertools
+from math import factorial
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+
+import nba_rebuilds
+import nba_rebuilds.tree_shap
+from nba_rebuilds.predictor import PlayoffPredictor
+from nba_rebuilds.tree_shap import TreeShapExplainer, _ensemble_trees
+
+
+def _conditional_expectation(tree, x, subset):
+    t = tree.tree_
+
+    def walk(node):
+        if t.children_left[node] == t.children_right[node]:
+            return t.value[node].ravel()[0]
+        left, right = t.children_left[node], t.children_right[node]
+        if t.feature[node] in subset:
+            return walk(left) if np.float32(x[t.feature[node]]) <= t.threshold[node] else walk(right)
+        cover = t.weighted_n_node_samples
+        return (cover[left] * walk(left) + cover[right] * walk(right)) / cover[node]
+
+    return walk(0)
+
+
+def _brute_force_shap(model, x, n_features):
+    trees, weights, _ = _ensemble_trees(model, n_features)
+
+    def value(subset):
+        return sum(w * _conditional_expectation(tree, x, subset) for tree, w in zip(trees, weights))
+
+    phi = np.zeros(n_features)
+    for i in range(n_features):
+        others = [j for j in range(n_features) if j != i]
+        for size in range(n_features):
+            weight = factorial(size) * factorial(n_features - size - 1) / factorial(n_features)
+            for subset in itertools.combinations(others, size):
+                phi[i] += weight * (value(set(subset) | {i}) - value(set(subset)))
+    return phi
+
+
+def test_matches_brute_force_shapley():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 4))
+    y = X[:, 0] * X[:, 1] + np.sin(X[:, 2]) + X[:, 3] ** 2
+
+    models = [
+        GradientBoostingRegressor(n_estimators=5, max_depth=4, random_state=0),
+        RandomForestRegressor(n_estimators=3, max_depth=6, random_state=0),
+    ]
+    for model in models:
+        model.fit(X, y)
+        explainer = TreeShapExplainer(model, 4)
+        values = explainer.shap_values(X[:3])
+        for row, phi in zip(X[:3], values):
+            np.testing.assert_allclose(phi, _brute_force_shap(model, row, 4), atol=1e-10)
+
+
+def test_untabled_fallback_matches_brute_force(monkeypatch):
+    # Force the per-row polynomial path used for trees too deep to tabulate
+    monkeypatch.setattr(nba_rebuilds.tree_shap, "_TABLE_ELEMENTS", 0)
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(300, 4))
+    y = X[:, 0] * X[:, 1] + np.sin(X[:, 2]) + X[:, 3] ** 2
+
+    model = GradientBoostingRegressor(n_estimators=5, max_depth=4, random_state=0).fit(X, y)
+    explainer = TreeShapExplainer(model, 4)
+    assert explainer._table is None
+    values = explainer.shap_values(X[:3])
+    for row, phi in zip(X[:3], values):
+        np.testing.assert_allclose(phi, _brute_force_shap(model, row, 4), atol=1e-10)
+
+
+def test_explain_sums_to_prediction():
+    predictor = PlayoffPredictor()
+    data_path = Path(nba_rebuilds.__file__).parent / "data" / "final_combined_file.csv"
+    df = pd.read_csv(data_path, usecols=predictor.feature_cols).head(100)
+
+    contributions = predictor.explain(df)
+    assert list(contributions.columns) == predictor.feature_cols
+    np.testing.assert_allclose(
+        contributions.sum(axis=1) + predictor.expected_value,
+        predictor.predict_batch(df),
+        atol=1e-9,
+    )